@@ -35,7 +35,7 @@ class IngestSettings(BaseSettings):
     """Ingest engine configuration"""
 
     # Batch processing
-    batch_size: int = Field(default=100, env="INGEST_BATCH_SIZE")
+    batch_size: int = Field(default=1000, env="INGEST_BATCH_SIZE")
 
     # Excel settings
     excel_max_rows: int = Field(default=100000, env="EXCEL_MAX_ROWS")
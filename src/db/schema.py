@@ -12,7 +12,7 @@ This schema supports:
 
 from sqlalchemy import (
     create_engine, Column, Integer, String, Text, DateTime, Boolean,
-    ForeignKey, JSON, Enum, Float, Table, UniqueConstraint, Index
+    ForeignKey, JSON, Enum, Float, Table, UniqueConstraint, Index, event
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
@@ -371,9 +371,25 @@ class ObsidianNote(Base):
 
 # === DATABASE SETUP ===
 
-def get_engine(connection_string: str):
-    """Create database engine"""
-    return create_engine(connection_string, echo=False)
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Per-connection SQLite tuning: WAL so a commit appends to the log instead of
+    rewriting pages under an fsync'd rollback journal; synchronous=NORMAL so only
+    checkpoints fsync (still crash-safe in WAL mode); temp tables in memory.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def get_engine(connection_string: str, **kwargs):
+    """Create database engine (kwargs go to create_engine, e.g. pool_size)"""
+    engine = create_engine(connection_string, echo=False, **kwargs)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
 
 
 def create_all_tables(engine):
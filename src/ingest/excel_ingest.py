@@ -16,15 +16,16 @@ Features:
 """
 
 import os
-import hashlib
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Generator, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
+from sqlalchemy import insert
 from tqdm import tqdm
 
 # Local imports
@@ -34,9 +35,23 @@ from db.schema import (
     SourceType, ConfidenceLevel, IngestSession, IngestRecord,
     ExcelSheet, get_session, get_engine
 )
+from utils.hashing import hash_content
+from utils.file_walk import walk_files
 
+# One ExcelCell per cell adds up - drop the per-instance __dict__ where supported (3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _is_missing(value: Any) -> bool:
+    """Scalar pd.isna, answering plain floats and strings without calling into pandas"""
+    if isinstance(value, float):
+        return value != value  # Only NaN is unequal to itself (covers numpy float64)
+    if isinstance(value, str):
+        return False
+    return bool(pd.isna(value))
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ExcelCell:
     """Represents a single Excel cell with metadata"""
     value: Any
@@ -48,7 +63,7 @@ class ExcelCell:
     formula: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ExcelRow:
     """Represents a row of Excel data"""
     row_number: int
@@ -87,21 +102,26 @@ class ExcelIngester:
         ingester.ingest_directory("/path/to/excel/files")
     """
 
-    def __init__(self, db_connection_string: Optional[str] = None, batch_size: int = 100):
+    def __init__(self, db_connection_string: Optional[str] = None, batch_size: int = 1000,
+                 engine=None):
         """
         Initialize the Excel ingester.
 
         Args:
             db_connection_string: PostgreSQL connection string
-            batch_size: Number of rows to process before committing
+            batch_size: Number of rows to buffer before each bulk INSERT + commit
+            engine: Existing SQLAlchemy engine to share (overrides db_connection_string)
         """
         self.db_connection_string = db_connection_string
         self.batch_size = batch_size
-        self.engine = None
+        self.engine = engine
         self.session = None
         self.current_ingest_session: Optional[IngestSession] = None
 
-        if db_connection_string:
+        # Ingest records waiting for the next bulk INSERT
+        self._pending_records: List[Dict[str, Any]] = []
+
+        if self.engine is None and db_connection_string:
             self.engine = get_engine(db_connection_string)
 
     def _ensure_session(self):
@@ -120,12 +140,16 @@ class ExcelIngester:
         )
         if self.session:
             self.session.add(session)
-            self.session.commit()
+            try:
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
         return session
 
     def _hash_content(self, content: str) -> str:
-        """Create SHA-256 hash of content for deduplication"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Create hash of content for deduplication"""
+        return hash_content(content)
 
     def read_file(self, file_path: str) -> List[ExcelSheetData]:
         """
@@ -173,15 +197,19 @@ class ExcelIngester:
                 header = str(cell.value) if cell.value else f"Column_{col}"
                 headers.append(header)
 
+            # Column letters are the same on every row - work them out once per sheet
+            columns = list(zip(range(1, max_col + 1), headers,
+                               [get_column_letter(col) for col in range(1, max_col + 1)]))
+
             # Extract rows
             rows = []
             for row_num in range(2, max_row + 1):
                 cells_dict = {}
                 raw_cells = []
 
-                for col_num, header in enumerate(headers, 1):
+                for col_num, header, column_letter in columns:
                     cell = worksheet.cell(row=row_num, column=col_num)
-                    cell_ref = f"{get_column_letter(col_num)}{row_num}"
+                    cell_ref = f"{column_letter}{row_num}"
 
                     excel_cell = ExcelCell(
                         value=cell.value,
@@ -235,6 +263,7 @@ class ExcelIngester:
                 continue
 
             headers = df.columns.tolist()
+            column_letters = [get_column_letter(col) for col in range(1, len(headers) + 1)]
 
             rows = []
             for idx, row in df.iterrows():
@@ -243,18 +272,19 @@ class ExcelIngester:
 
                 raw_cells = []
                 for col_num, (header, value) in enumerate(cells_dict.items(), 1):
-                    cell_ref = f"{get_column_letter(col_num)}{row_num}"
+                    cell_ref = f"{column_letters[col_num - 1]}{row_num}"
+                    missing = _is_missing(value)
+                    if missing:
+                        # Clean NaN values
+                        cells_dict[header] = None
                     raw_cells.append(ExcelCell(
-                        value=value if pd.notna(value) else None,
+                        value=None if missing else value,
                         row=row_num,
                         column=col_num,
                         cell_ref=cell_ref,
-                        data_type=type(value).__name__ if pd.notna(value) else 'null'
+                        data_type='null' if missing else type(value).__name__
                     ))
 
-                # Clean NaN values
-                cells_dict = {k: (v if pd.notna(v) else None) for k, v in cells_dict.items()}
-
                 rows.append(ExcelRow(
                     row_number=row_num,
                     cells=cells_dict,
@@ -294,6 +324,7 @@ class ExcelIngester:
 
         stats = {
             "file": file_path,
+            "session_id": self.current_ingest_session.id if self.current_ingest_session else None,
             "sheets_processed": 0,
             "rows_processed": 0,
             "records_created": 0,
@@ -312,6 +343,8 @@ class ExcelIngester:
 
         except Exception as e:
             stats["errors"].append(f"File error: {str(e)}")
+            if self.session:
+                self.session.rollback()
 
         # Update ingest session
         if self.current_ingest_session and self.session:
@@ -320,7 +353,11 @@ class ExcelIngester:
             self.current_ingest_session.records_created = stats["records_created"]
             self.current_ingest_session.records_failed = len(stats["errors"])
             self.current_ingest_session.error_log = "\n".join(stats["errors"]) if stats["errors"] else None
-            self.session.commit()
+            try:
+                self.session.commit()
+            except Exception as e:
+                self.session.rollback()
+                stats["errors"].append(f"Session update failed: {str(e)}")
 
         return stats
 
@@ -345,42 +382,39 @@ class ExcelIngester:
 
         # Process rows
         rows_iter = tqdm(sheet_data.rows, desc=f"Sheet: {sheet_data.sheet_name}") if progress else sheet_data.rows
+        session_id = self.current_ingest_session.id if self.current_ingest_session else None
 
-        batch = []
         for row in rows_iter:
             try:
-                # Create ingest record for each row
+                # Queue an ingest record for each row
                 content = str(row.cells)
-                record = IngestRecord(
-                    session_id=self.current_ingest_session.id if self.current_ingest_session else None,
-                    source_type=SourceType.EXCEL,
-                    source_file=sheet_data.file_path,
-                    source_sheet=sheet_data.sheet_name,
-                    source_row=row.row_number,
-                    raw_content=content,
-                    processed_content=content,
-                    content_hash=self._hash_content(content),
-                    confidence=ConfidenceLevel.HIGH,  # Excel data is reliable
-                    needs_review=False  # Mark as not needing review since it's from structured source
-                )
-
-                batch.append(record)
+                self._pending_records.append({
+                    "session_id": session_id,
+                    "source_type": SourceType.EXCEL,
+                    "source_file": sheet_data.file_path,
+                    "source_sheet": sheet_data.sheet_name,
+                    "source_row": row.row_number,
+                    "raw_content": content,
+                    "processed_content": content,
+                    "content_hash": self._hash_content(content),
+                    "confidence": ConfidenceLevel.HIGH,  # Excel data is reliable
+                    "needs_review": False  # Mark as not needing review since it's from structured source
+                })
                 stats["rows"] += 1
                 stats["created"] += 1
 
-                # Batch commit
-                if len(batch) >= self.batch_size and self.session:
-                    self.session.add_all(batch)
-                    self.session.commit()
-                    batch = []
-
             except Exception as e:
                 stats["errors"].append(f"Row {row.row_number}: {str(e)}")
+                continue
 
-        # Commit remaining batch
-        if batch and self.session:
-            self.session.add_all(batch)
-            self.session.commit()
+            # Batch insert
+            if (len(self._pending_records) >= self.batch_size
+                    and not self._flush_sheet(stats, f"Sheet {sheet_data.sheet_name}")):
+                return stats
+
+        # Insert remaining batch
+        if not self._flush_sheet(stats, f"Sheet {sheet_data.sheet_name}"):
+            return stats
 
         if self.session:
             excel_sheet.fully_processed = True
@@ -388,6 +422,40 @@ class ExcelIngester:
 
         return stats
 
+    def _flush_sheet(self, stats: Dict[str, Any], label: str) -> bool:
+        """
+        flush() for _ingest_sheet. A failed write rolls back the batch (and the
+        sheet record, if it wasn't committed yet), so the batch is taken out of
+        the sheet stats and the caller stops the sheet.
+
+        Returns:
+            False if the write failed
+        """
+        batch_size = len(self._pending_records)
+        try:
+            self.flush()
+        except Exception as e:
+            stats["rows"] -= batch_size
+            stats["created"] -= batch_size
+            stats["errors"].append(f"{label}: write failed, rest of sheet skipped: {str(e)}")
+            return False
+        return True
+
+    def flush(self):
+        """Write buffered ingest records with one multi-row INSERT and commit"""
+        if not self._pending_records:
+            return
+
+        records, self._pending_records = self._pending_records, []
+        if self.session:
+            try:
+                self.session.execute(insert(IngestRecord), records)
+                self.session.commit()
+            except Exception:
+                # Keep the session usable for the next batch and file
+                self.session.rollback()
+                raise
+
     def ingest_directory(self, directory_path: str, recursive: bool = True,
                          extensions: List[str] = None) -> Dict[str, Any]:
         """
@@ -404,12 +472,8 @@ class ExcelIngester:
         if extensions is None:
             extensions = ['.xlsx', '.xls']
 
-        directory = Path(directory_path)
-        pattern = "**/*" if recursive else "*"
-
-        files = []
-        for ext in extensions:
-            files.extend(directory.glob(f"{pattern}{ext}"))
+        # One walk for all extensions rather than a glob per extension
+        files = list(walk_files(str(Path(directory_path)), extensions, recursive))
 
         total_stats = {
             "files_processed": 0,
@@ -421,7 +485,7 @@ class ExcelIngester:
 
         for file_path in tqdm(files, desc="Processing Excel files"):
             try:
-                stats = self.ingest_file(str(file_path), progress=False)
+                stats = self.ingest_file(file_path, progress=False)
                 total_stats["files_processed"] += 1
                 total_stats["total_sheets"] += stats["sheets_processed"]
                 total_stats["total_rows"] += stats["rows_processed"]
@@ -432,20 +496,22 @@ class ExcelIngester:
 
         return total_stats
 
-    def to_dataframe(self, file_path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    def to_dataframe(self, file_path: str, sheet_name: Optional[str] = None,
+                     nrows: Optional[int] = None) -> pd.DataFrame:
         """
         Read Excel file directly to pandas DataFrame (convenience method).
 
         Args:
             file_path: Path to Excel file
             sheet_name: Specific sheet to read (default: first sheet)
+            nrows: Only read this many data rows (default: all)
 
         Returns:
             pandas DataFrame
         """
         if sheet_name:
-            return pd.read_excel(file_path, sheet_name=sheet_name)
-        return pd.read_excel(file_path)
+            return pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
+        return pd.read_excel(file_path, nrows=nrows)
 
     def get_sheet_preview(self, file_path: str, sheet_name: str = None,
                           n_rows: int = 10) -> Dict[str, Any]:
@@ -460,6 +526,11 @@ class ExcelIngester:
         Returns:
             Dictionary with headers and sample rows
         """
+        if os.path.splitext(file_path)[1].lower() == '.xlsx':
+            preview = self._preview_xlsx(file_path, sheet_name, n_rows)
+            if preview is not None:
+                return preview
+
         sheets = self.read_file(file_path)
 
         if not sheets:
@@ -489,8 +560,65 @@ class ExcelIngester:
             }
         }
 
+    def _preview_xlsx(self, file_path: str, sheet_name: Optional[str],
+                      n_rows: int) -> Optional[Dict[str, Any]]:
+        """
+        Stream the header and first n_rows rows of one .xlsx sheet.
+
+        Uses openpyxl's read-only mode, so only the rows shown are parsed;
+        row/column counts come from the dimensions recorded in the file.
+        Returns None when those aren't recorded, in which case the caller
+        falls back to a full read.
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            names = workbook.sheetnames
+            if not names:
+                return None
+            name = sheet_name if sheet_name in names else names[0]
+            worksheet = workbook[name]
+
+            max_row = worksheet.max_row
+            max_col = worksheet.max_column
+            if not max_row or not max_col or n_rows < 0:
+                return None
+
+            last_row = min(max_row, n_rows + 1)
+            rows_iter = worksheet.iter_rows(min_row=1, max_row=last_row,
+                                            max_col=max_col, values_only=True)
+
+            # Rows absent from the sheet XML aren't yielded; treat them as blank
+            blank_row = (None,) * max_col
+            header_values = next(rows_iter, blank_row)
+            headers = [str(value) if value else f"Column_{col}"
+                       for col, value in enumerate(header_values, 1)]
+            preview_rows = [
+                {
+                    "row_number": row_num,
+                    "data": dict(zip(headers, next(rows_iter, blank_row)))
+                }
+                for row_num in range(2, last_row + 1)
+            ]
+        finally:
+            workbook.close()
+
+        return {
+            "file": file_path,
+            "sheet": name,
+            "headers": headers,
+            "total_rows": max_row - 1,
+            "preview_rows": preview_rows,
+            "source_attribution": {
+                "source_type": "EXCEL",
+                "source_file": file_path,
+                "source_sheet": name,
+                "ingested_by": "python/ExcelIngester"
+            }
+        }
+
     def close(self):
-        """Close database session"""
+        """Flush buffered records and close database session"""
+        self.flush()
         if self.session:
             self.session.close()
             self.session = None
@@ -498,6 +626,12 @@ class ExcelIngester:
 
 # === CONVENIENCE FUNCTIONS ===
 
+@lru_cache(maxsize=None)
+def _default_ingester() -> ExcelIngester:
+    """DB-less ingester shared by the convenience functions (parsing keeps no per-call state)"""
+    return ExcelIngester()
+
+
 def quick_ingest(file_path: str, db_url: str = None) -> Dict[str, Any]:
     """
     Quick one-liner to ingest an Excel file.
@@ -525,8 +659,7 @@ def excel_to_dict(file_path: str) -> Dict[str, List[Dict]]:
     Returns:
         Dictionary with sheet names as keys, list of row dicts as values
     """
-    ingester = ExcelIngester()
-    sheets = ingester.read_file(file_path)
+    sheets = _default_ingester().read_file(file_path)
 
     result = {}
     for sheet in sheets:
@@ -16,17 +16,17 @@ Features:
 """
 
 import os
-import hashlib
-import re
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from dataclasses import dataclass, field
+from functools import lru_cache
 from io import StringIO
 
 import pandas as pd
 from bs4 import BeautifulSoup
 import chardet
+from sqlalchemy import insert
 
 # Local imports
 import sys
@@ -35,6 +35,8 @@ from db.schema import (
     SourceType, ConfidenceLevel, IngestSession, IngestRecord,
     HTMLTable, get_session, get_engine
 )
+from utils.hashing import hash_content
+from utils.file_walk import walk_files
 
 
 @dataclass
@@ -87,19 +89,31 @@ class HTMLIngester:
         ingester.ingest_file("page.html")
     """
 
-    def __init__(self, db_connection_string: Optional[str] = None):
+    # Zero-width characters stripped from cell text, as one translate() table
+    ZERO_WIDTH_TABLE = str.maketrans('', '', '\u200b\u200c\u200d\ufeff')
+    # Header-text check: spaces and hyphens count as underscores, in one translate()
+    HEADER_KEY_TABLE = str.maketrans(' -', '__')
+
+    def __init__(self, db_connection_string: Optional[str] = None, batch_size: int = 1000,
+                 engine=None):
         """
         Initialize the HTML ingester.
 
         Args:
             db_connection_string: PostgreSQL connection string
+            batch_size: Number of rows to buffer before each bulk INSERT + commit
+            engine: Existing SQLAlchemy engine to share (overrides db_connection_string)
         """
         self.db_connection_string = db_connection_string
-        self.engine = None
+        self.batch_size = batch_size
+        self.engine = engine
         self.session = None
         self.current_ingest_session: Optional[IngestSession] = None
 
-        if db_connection_string:
+        # Ingest records waiting for the next bulk INSERT
+        self._pending_records: List[Dict[str, Any]] = []
+
+        if self.engine is None and db_connection_string:
             self.engine = get_engine(db_connection_string)
 
     def _ensure_session(self):
@@ -122,12 +136,16 @@ class HTMLIngester:
         )
         if self.session:
             self.session.add(session)
-            self.session.commit()
+            try:
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
         return session
 
     def _hash_content(self, content: str) -> str:
-        """Create SHA-256 hash of content for deduplication"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Create hash of content for deduplication"""
+        return hash_content(content)
 
     def _detect_encoding(self, content: bytes) -> str:
         """Detect file encoding"""
@@ -144,15 +162,31 @@ class HTMLIngester:
 
     def _clean_cell_value(self, value: Any) -> Any:
         """Clean and normalize cell values"""
-        if pd.isna(value):
-            return None
-
+        # Strings first: every bs4 cell is one, and pd.isna is never true for them
         if isinstance(value, str):
-            # Clean whitespace
+            # Fast path: printable ASCII has no whitespace but ' ', so the
+            # value is already clean unless a space is doubled or at an edge
+            if (value and value.isascii() and value.isprintable()
+                    and value[0] != ' ' and value[-1] != ' ' and '  ' not in value):
+                return value
+
+            # Collapse whitespace (this also trims)
             value = ' '.join(value.split())
-            # Remove zero-width characters
-            value = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', value)
-            return value.strip() if value.strip() else None
+            # Zero-width characters are non-ASCII; removing one can expose an edge space
+            if not value.isascii():
+                value = value.translate(self.ZERO_WIDTH_TABLE).strip()
+            return value or None
+
+        # Plain Python scalars need no pandas call; NaN is the only float unequal to itself
+        if value is None:
+            return None
+        if isinstance(value, float):
+            return None if value != value else value
+        if isinstance(value, int):
+            return value
+
+        if pd.isna(value):
+            return None
 
         return value
 
@@ -162,7 +196,7 @@ class HTMLIngester:
         seen = {}
 
         for i, header in enumerate(headers):
-            if header is None or (isinstance(header, float) and pd.isna(header)):
+            if header is None or (isinstance(header, float) and header != header):  # NaN
                 header = f"Column_{i + 1}"
             else:
                 header = str(header).strip()
@@ -206,14 +240,10 @@ class HTMLIngester:
                 headers = self._normalize_headers(df.columns.tolist())
                 df.columns = headers
 
-                # Convert to rows
-                rows = []
-                for row_idx, row in df.iterrows():
-                    row_dict = {}
-                    for header in headers:
-                        value = self._clean_cell_value(row[header])
-                        row_dict[header] = value
-                    rows.append(row_dict)
+                # Convert to rows: clean column by column, then zip into row dicts
+                clean = self._clean_cell_value
+                columns = [[clean(value) for value in df[header].tolist()] for header in headers]
+                rows = [dict(zip(headers, values)) for values in zip(*columns)]
 
                 tables.append(ExtractedTable(
                     table_index=idx,
@@ -272,10 +302,11 @@ class HTMLIngester:
                 first_cells = first_row.find_all(['th', 'td'])
 
                 # Heuristic: if first row has <th> tags or looks like headers
+                first_texts = [cell.get_text(strip=True) for cell in first_cells[:3]]
                 if first_row.find_all('th') or all(
-                    cell.get_text(strip=True).replace(' ', '_').replace('-', '_').isidentifier()
-                    for cell in first_cells[:3]
-                    if cell.get_text(strip=True)
+                    text.translate(self.HEADER_KEY_TABLE).isidentifier()
+                    for text in first_texts
+                    if text
                 ):
                     headers = [self._clean_cell_value(cell.get_text(strip=True)) for cell in first_cells]
                     data_rows = all_rows[1:]
@@ -368,6 +399,7 @@ class HTMLIngester:
 
         stats = {
             "file": file_path,
+            "session_id": self.current_ingest_session.id if self.current_ingest_session else None,
             "tables_found": 0,
             "rows_processed": 0,
             "records_created": 0,
@@ -386,6 +418,8 @@ class HTMLIngester:
 
         except Exception as e:
             stats["errors"].append(f"File error: {str(e)}")
+            if self.session:
+                self.session.rollback()
 
         # Update ingest session
         if self.current_ingest_session and self.session:
@@ -393,7 +427,11 @@ class HTMLIngester:
             self.current_ingest_session.records_processed = stats["rows_processed"]
             self.current_ingest_session.records_created = stats["records_created"]
             self.current_ingest_session.records_failed = len(stats["errors"])
-            self.session.commit()
+            try:
+                self.session.commit()
+            except Exception as e:
+                self.session.rollback()
+                stats["errors"].append(f"Session update failed: {str(e)}")
 
         return stats
 
@@ -418,36 +456,78 @@ class HTMLIngester:
             self.session.add(html_table)
 
         # Process rows
+        session_id = self.current_ingest_session.id if self.current_ingest_session else None
+
         for row_idx, row in enumerate(table.rows):
             try:
                 content = str(row)
-                record = IngestRecord(
-                    session_id=self.current_ingest_session.id if self.current_ingest_session else None,
-                    source_type=SourceType.HTML,
-                    source_file=table.source_file,
-                    source_url=table.source_url,
-                    source_row=row_idx + 1,
-                    raw_content=content,
-                    processed_content=content,
-                    content_hash=self._hash_content(content),
-                    confidence=ConfidenceLevel.HIGH,
-                    needs_review=False
-                )
-
-                if self.session:
-                    self.session.add(record)
+                self._pending_records.append({
+                    "session_id": session_id,
+                    "source_type": SourceType.HTML,
+                    "source_file": table.source_file,
+                    "source_url": table.source_url,
+                    "source_row": row_idx + 1,
+                    "raw_content": content,
+                    "processed_content": content,
+                    "content_hash": self._hash_content(content),
+                    "confidence": ConfidenceLevel.HIGH,
+                    "needs_review": False
+                })
 
                 stats["rows"] += 1
                 stats["created"] += 1
 
             except Exception as e:
                 stats["errors"].append(f"Row {row_idx}: {str(e)}")
+                continue
+
+            # Batch insert
+            if (len(self._pending_records) >= self.batch_size
+                    and not self._flush_table(stats, f"Table {table.table_index}")):
+                return stats
 
+        # Insert remaining batch (also commits the table record)
+        if not self._flush_table(stats, f"Table {table.table_index}"):
+            return stats
         if self.session:
             self.session.commit()
 
         return stats
 
+    def _flush_table(self, stats: Dict[str, Any], label: str) -> bool:
+        """
+        flush() for _ingest_table. A failed write rolls back the batch (and the
+        table record, if it wasn't committed yet), so the batch is taken out of
+        the table stats and the caller stops the table.
+
+        Returns:
+            False if the write failed
+        """
+        batch_size = len(self._pending_records)
+        try:
+            self.flush()
+        except Exception as e:
+            stats["rows"] -= batch_size
+            stats["created"] -= batch_size
+            stats["errors"].append(f"{label}: write failed, rest of table skipped: {str(e)}")
+            return False
+        return True
+
+    def flush(self):
+        """Write buffered ingest records with one multi-row INSERT and commit"""
+        if not self._pending_records:
+            return
+
+        records, self._pending_records = self._pending_records, []
+        if self.session:
+            try:
+                self.session.execute(insert(IngestRecord), records)
+                self.session.commit()
+            except Exception:
+                # Keep the session usable for the next batch and file
+                self.session.rollback()
+                raise
+
     def ingest_directory(self, directory_path: str, recursive: bool = True,
                          extensions: List[str] = None) -> Dict[str, Any]:
         """
@@ -464,12 +544,8 @@ class HTMLIngester:
         if extensions is None:
             extensions = ['.html', '.htm']
 
-        directory = Path(directory_path)
-        pattern = "**/*" if recursive else "*"
-
-        files = []
-        for ext in extensions:
-            files.extend(directory.glob(f"{pattern}{ext}"))
+        # One walk for all extensions rather than a glob per extension
+        files = list(walk_files(str(Path(directory_path)), extensions, recursive))
 
         total_stats = {
             "files_processed": 0,
@@ -480,7 +556,7 @@ class HTMLIngester:
 
         for file_path in files:
             try:
-                stats = self.ingest_file(str(file_path))
+                stats = self.ingest_file(file_path)
                 total_stats["files_processed"] += 1
                 total_stats["total_tables"] += stats["tables_found"]
                 total_stats["total_rows"] += stats["rows_processed"]
@@ -557,7 +633,8 @@ class HTMLIngester:
         }
 
     def close(self):
-        """Close database session"""
+        """Flush buffered records and close database session"""
+        self.flush()
         if self.session:
             self.session.close()
             self.session = None
@@ -565,6 +642,12 @@ class HTMLIngester:
 
 # === CONVENIENCE FUNCTIONS ===
 
+@lru_cache(maxsize=None)
+def _default_ingester() -> HTMLIngester:
+    """DB-less ingester shared by the convenience functions (parsing keeps no per-call state)"""
+    return HTMLIngester()
+
+
 def html_tables_to_dict(file_path: str) -> List[Dict]:
     """
     Convert HTML tables to list of dictionaries (no database required).
@@ -575,8 +658,7 @@ def html_tables_to_dict(file_path: str) -> List[Dict]:
     Returns:
         List of tables, each with headers, rows, and source attribution
     """
-    ingester = HTMLIngester()
-    tables = ingester.extract_tables_from_file(file_path)
+    tables = _default_ingester().extract_tables_from_file(file_path)
 
     return [
         {
@@ -17,11 +17,11 @@ Features:
 
 import os
 import re
-import hashlib
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple, Set
 from datetime import datetime
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 import frontmatter
 import markdown
@@ -34,6 +34,8 @@ from db.schema import (
     SourceType, ConfidenceLevel, DefinitionStatus, IngestSession,
     IngestRecord, ObsidianNote, Definition, get_session, get_engine
 )
+from utils.hashing import hash_content
+from utils.file_walk import walk_files
 
 
 @dataclass
@@ -97,11 +99,16 @@ class MarkdownIngester:
     """
 
     # Regex patterns
-    WIKILINK_PATTERN = re.compile(r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]')
+    # Links never span lines; the length caps keep unclosed "[[" runs from going quadratic
+    WIKILINK_PATTERN = re.compile(r'\[\[([^\]|\n]{1,500})(?:\|([^\]\n]{1,500}))?\]\]')
     TAG_PATTERN = re.compile(r'(?:^|\s)#([a-zA-Z][a-zA-Z0-9_/-]*)')
     EQUATION_BLOCK_PATTERN = re.compile(r'\$\$(.+?)\$\$', re.DOTALL)
     INLINE_EQUATION_PATTERN = re.compile(r'\$([^$\n]+)\$')
-    HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+    HEADER_PATTERN = re.compile(r'^(#{1,6})[^\S\n]+(.+)$', re.MULTILINE)  # Never spans lines
+    H1_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+    WORD_PATTERN = re.compile(r'\b\w+\b')
+    AXIOM_PATTERN = re.compile(r'^(\d+\.|Axiom\s+\w+:|-|\*)')
+    DOMAIN_HEADER_PATTERN = re.compile(r'^#{2,4}\s*\d*\.?\d*\s*(.+)$')
 
     # Definition template sections to extract
     DEFINITION_SECTIONS = [
@@ -122,15 +129,34 @@ class MarkdownIngester:
         "Notes"
     ]
 
-    def __init__(self, db_connection_string: Optional[str] = None):
+    # Section headers that mark a note as a definition even without frontmatter
+    DEFINITION_MARKER_SECTIONS = frozenset({
+        "canonical_definition",
+        "Core Definition",
+        "1. Core Definition"
+    })
+
+    # Frontmatter status -> DefinitionStatus (anything else stores as DRAFT)
+    STATUS_MAP = {
+        "canonical": DefinitionStatus.CANONICAL,
+        "draft": DefinitionStatus.DRAFT,
+        "review": DefinitionStatus.REVIEW,
+        "deprecated": DefinitionStatus.DEPRECATED
+    }
+
+    def __init__(self, db_connection_string: Optional[str] = None, batch_size: int = 100,
+                 engine=None):
         """
         Initialize the Markdown ingester.
 
         Args:
             db_connection_string: PostgreSQL connection string
+            batch_size: Number of notes to ingest before committing (vault ingest)
+            engine: Existing SQLAlchemy engine to share (overrides db_connection_string)
         """
         self.db_connection_string = db_connection_string
-        self.engine = None
+        self.batch_size = batch_size
+        self.engine = engine
         self.session = None
         self.current_ingest_session: Optional[IngestSession] = None
 
@@ -142,7 +168,7 @@ class MarkdownIngester:
             'toc'
         ])
 
-        if db_connection_string:
+        if self.engine is None and db_connection_string:
             self.engine = get_engine(db_connection_string)
 
     def _ensure_session(self):
@@ -165,11 +191,21 @@ class MarkdownIngester:
         return session
 
     def _hash_content(self, content: str) -> str:
-        """Create SHA-256 hash of content for deduplication"""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        """Create hash of content for deduplication"""
+        return hash_content(content)
+
+    @staticmethod
+    def _coerce_list(value: Any) -> List[str]:
+        """Coerce a frontmatter list field that may be written as a comma-separated string"""
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',')]
+        return list(value) if value else []
 
     def _extract_wikilinks(self, content: str) -> List[str]:
         """Extract [[wikilinks]] from content"""
+        if '[[' not in content:
+            return []
+
         links = []
         for match in self.WIKILINK_PATTERN.finditer(content):
             link_target = match.group(1).strip()
@@ -178,6 +214,9 @@ class MarkdownIngester:
 
     def _extract_tags(self, content: str) -> List[str]:
         """Extract #tags from content"""
+        if '#' not in content:
+            return []
+
         tags = []
         for match in self.TAG_PATTERN.finditer(content):
             tag = match.group(1).strip()
@@ -187,6 +226,10 @@ class MarkdownIngester:
 
     def _extract_equations(self, content: str) -> List[str]:
         """Extract LaTeX equations from content"""
+        # Most notes have no LaTeX at all; skip both regex scans
+        if '$' not in content:
+            return []
+
         equations = []
 
         # Block equations $$...$$
@@ -206,26 +249,21 @@ class MarkdownIngester:
     def _extract_sections(self, content: str) -> Dict[str, str]:
         """Extract sections based on headers"""
         sections = {}
-        lines = content.split('\n')
 
         current_header = None
-        current_content = []
+        section_start = 0
 
-        for line in lines:
-            header_match = self.HEADER_PATTERN.match(line)
-            if header_match:
-                # Save previous section
-                if current_header:
-                    sections[current_header] = '\n'.join(current_content).strip()
+        for header_match in self.HEADER_PATTERN.finditer(content):
+            # Save previous section as a single slice of the content
+            if current_header:
+                sections[current_header] = content[section_start:header_match.start()].strip()
 
-                current_header = header_match.group(2).strip()
-                current_content = []
-            elif current_header:
-                current_content.append(line)
+            current_header = header_match.group(2).strip()
+            section_start = header_match.end()
 
         # Save last section
         if current_header:
-            sections[current_header] = '\n'.join(current_content).strip()
+            sections[current_header] = content[section_start:].strip()
 
         return sections
 
@@ -239,7 +277,7 @@ class MarkdownIngester:
             return frontmatter_data['name']
 
         # Try first H1 header
-        h1_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        h1_match = self.H1_PATTERN.search(content)
         if h1_match:
             return h1_match.group(1).strip()
 
@@ -277,7 +315,7 @@ class MarkdownIngester:
         title = self._extract_title(content, fm_data)
 
         # Count words
-        word_count = len(re.findall(r'\b\w+\b', content))
+        word_count = len(self.WORD_PATTERN.findall(content))
 
         return ParsedNote(
             file_path=file_path,
@@ -294,26 +332,29 @@ class MarkdownIngester:
             last_modified=last_modified
         )
 
-    def parse_as_definition(self, file_path: str) -> Optional[ParsedDefinition]:
+    def parse_as_definition(self, file_path: Optional[str] = None,
+                            note: Optional[ParsedNote] = None) -> Optional[ParsedDefinition]:
         """
         Parse a markdown file as a definition (using the 10-section template).
 
         Args:
             file_path: Path to markdown file
+            note: Already parsed note (skips re-reading and re-parsing the file)
 
         Returns:
             ParsedDefinition object if it looks like a definition, None otherwise
         """
-        note = self.parse_file(file_path)
+        if note is None:
+            if file_path is None:
+                raise ValueError("Either file_path or note must be provided")
+            note = self.parse_file(file_path)
 
-        # Check if it looks like a definition
+        # Check if it looks like a definition (cheap checks only, before any extraction)
         fm = note.frontmatter
         is_definition = (
             fm.get('type') == 'definition' or
             'symbol' in fm or
-            'canonical_definition' in note.sections or
-            'Core Definition' in note.sections or
-            '1. Core Definition' in note.sections
+            not self.DEFINITION_MARKER_SECTIONS.isdisjoint(note.sections)
         )
 
         if not is_definition:
@@ -323,12 +364,7 @@ class MarkdownIngester:
         definition_id = fm.get('id') or fm.get('definition_id')
         symbol = fm.get('symbol')
         name = fm.get('name') or note.title
-        aliases = fm.get('aliases', [])
-        if isinstance(aliases, str):
-            aliases = [a.strip() for a in aliases.split(',')]
-
-        # Extract domains
-        domains = fm.get('domains', [])
+        aliases = self._coerce_list(fm.get('aliases'))
 
         # Status
         status = fm.get('status', 'draft')
@@ -336,14 +372,18 @@ class MarkdownIngester:
         # Extract from sections
         sections = note.sections
 
+        # Lower-cased keys are computed once, in section order, for prefix matching
+        lowered_keys = [(key.lower(), key) for key in sections]
+
         # Helper to find section content
         def get_section(*possible_names):
             for name in possible_names:
                 if name in sections:
                     return sections[name]
                 # Try with number prefix
-                for key in sections:
-                    if name.lower() in key.lower():
+                lowered_name = name.lower()
+                for lowered_key, key in lowered_keys:
+                    if lowered_name in lowered_key:
                         return sections[key]
             return None
 
@@ -392,13 +432,16 @@ class MarkdownIngester:
         current_axiom = []
 
         for line in lines:
+            stripped = line.strip()
             # Check for axiom pattern like "Axiom C1:" or "1." or "- "
-            if re.match(r'^(\d+\.|Axiom\s+\w+:|-|\*)', line.strip()):
+            match = self.AXIOM_PATTERN.match(stripped)
+            if match:
                 if current_axiom:
                     axioms.append(' '.join(current_axiom).strip())
-                current_axiom = [re.sub(r'^(\d+\.|Axiom\s+\w+:|-|\*)\s*', '', line.strip())]
-            elif line.strip() and current_axiom:
-                current_axiom.append(line.strip())
+                # Drop the marker and any whitespace after it
+                current_axiom = [stripped[match.end():].lstrip()]
+            elif stripped and current_axiom:
+                current_axiom.append(stripped)
 
         if current_axiom:
             axioms.append(' '.join(current_axiom).strip())
@@ -413,7 +456,7 @@ class MarkdownIngester:
 
         for line in content.split('\n'):
             # Look for domain headers like "### Physics" or "#### 4.1 Physics"
-            domain_match = re.match(r'^#{2,4}\s*\d*\.?\d*\s*(.+)$', line.strip())
+            domain_match = self.DOMAIN_HEADER_PATTERN.match(line.strip())
             if domain_match:
                 if current_domain:
                     interpretations[current_domain] = '\n'.join(current_content).strip()
@@ -427,13 +470,15 @@ class MarkdownIngester:
 
         return interpretations
 
-    def ingest_file(self, file_path: str, as_definition: bool = False) -> Dict[str, Any]:
+    def ingest_file(self, file_path: str, as_definition: bool = False,
+                    commit: bool = True) -> Dict[str, Any]:
         """
         Ingest a markdown file into the database.
 
         Args:
             file_path: Path to markdown file
             as_definition: Try to parse as a definition template
+            commit: Commit immediately (ingest_vault commits in batches instead)
 
         Returns:
             Dictionary with ingest statistics
@@ -471,17 +516,21 @@ class MarkdownIngester:
 
                 # Try to parse as definition
                 if as_definition or note.frontmatter.get('type') == 'definition':
-                    definition = self.parse_as_definition(file_path)
+                    definition = self.parse_as_definition(note=note)
                     if definition:
                         stats["is_definition"] = True
                         self._store_definition(definition)
 
-                self.session.commit()
+                if commit:
+                    self.session.commit()
 
             stats["success"] = True
 
         except Exception as e:
             stats["errors"].append(str(e))
+            # Keep the session usable for the next file (batched callers handle their own)
+            if commit and self.session:
+                self.session.rollback()
 
         return stats
 
@@ -490,14 +539,6 @@ class MarkdownIngester:
         if not self.session:
             return
 
-        # Map status
-        status_map = {
-            "canonical": DefinitionStatus.CANONICAL,
-            "draft": DefinitionStatus.DRAFT,
-            "review": DefinitionStatus.REVIEW,
-            "deprecated": DefinitionStatus.DEPRECATED
-        }
-
         db_definition = Definition(
             definition_id=definition.definition_id,
             symbol=definition.symbol,
@@ -518,7 +559,7 @@ class MarkdownIngester:
             notes=definition.notes,
             source_type=SourceType.MARKDOWN,
             source_file=definition.note_path,
-            status=status_map.get(definition.status, DefinitionStatus.DRAFT),
+            status=self.STATUS_MAP.get(definition.status, DefinitionStatus.DRAFT),
             confidence=ConfidenceLevel.UNVERIFIED
         )
 
@@ -538,9 +579,9 @@ class MarkdownIngester:
             Aggregated statistics
         """
         vault = Path(vault_path)
-        pattern = "**/*.md" if recursive else "*.md"
 
-        files = list(vault.glob(pattern))
+        # Stream paths from the walker so ingest starts before the whole vault is listed
+        files = walk_files(str(vault), ['.md'], recursive)
 
         # Create ingest session
         self.current_ingest_session = self._create_ingest_session(str(vault))
@@ -552,16 +593,29 @@ class MarkdownIngester:
             "errors": []
         }
 
+        batch = []  # Notes queued since the last commit
         for file_path in files:
             try:
-                stats = self.ingest_file(str(file_path), as_definition=parse_definitions)
+                stats = self.ingest_file(file_path, as_definition=parse_definitions,
+                                         commit=False)
                 total_stats["files_processed"] += 1
                 if stats.get("is_definition"):
                     total_stats["definitions_found"] += 1
                 total_stats["errors"].extend(stats.get("errors", []))
+                if stats.get("success"):
+                    batch.append(file_path)
             except Exception as e:
                 total_stats["errors"].append(f"{file_path}: {str(e)}")
 
+            # Batch commit
+            if len(batch) >= self.batch_size:
+                self._commit_batch(batch, parse_definitions, total_stats)
+                batch = []
+
+        # Commit remaining batch
+        if batch:
+            self._commit_batch(batch, parse_definitions, total_stats)
+
         # Update session
         if self.current_ingest_session and self.session:
             self.current_ingest_session.completed_at = datetime.utcnow()
@@ -571,6 +625,33 @@ class MarkdownIngester:
 
         return total_stats
 
+    def _commit_batch(self, batch: List[str], as_definition: bool, total_stats: Dict[str, Any]):
+        """
+        Commit queued notes. If the commit fails, the batch is rolled back and
+        retried one note at a time, so a bad note only loses itself; errors from
+        the retry are added to the vault errors (counters are left as they are,
+        as for notes that fail in ingest_file).
+
+        The retry re-reads and re-parses every note in the batch, which only
+        costs anything when a batch commit has failed.
+        """
+        if not self.session:
+            return
+        try:
+            self.session.commit()
+            return
+        except Exception:
+            self.session.rollback()
+
+        for file_path in batch:
+            stats = self.ingest_file(file_path, as_definition=as_definition)
+            total_stats["errors"].extend(f"{file_path}: {error}" for error in stats["errors"])
+
+    def flush(self):
+        """Commit notes queued with ingest_file(commit=False)"""
+        if self.session and (self.session.new or self.session.dirty):
+            self.session.commit()
+
     def get_note_preview(self, file_path: str) -> Dict[str, Any]:
         """
         Get a preview of a markdown note.
@@ -601,7 +682,8 @@ class MarkdownIngester:
         }
 
     def close(self):
-        """Close database session"""
+        """Flush queued notes and close database session"""
+        self.flush()
         if self.session:
             self.session.close()
             self.session = None
@@ -609,17 +691,25 @@ class MarkdownIngester:
 
 # === CONVENIENCE FUNCTIONS ===
 
-def parse_obsidian_note(file_path: str) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def _default_ingester() -> MarkdownIngester:
+    """DB-less ingester shared by the convenience functions (parsing keeps no per-call state)"""
+    return MarkdownIngester()
+
+
+def parse_obsidian_note(file_path: str,
+                        ingester: Optional[MarkdownIngester] = None) -> Dict[str, Any]:
     """
     Quick parse of an Obsidian note (no database required).
 
     Args:
         file_path: Path to markdown file
+        ingester: Ingester to use (default: the shared DB-less one)
 
     Returns:
         Dictionary with parsed note data
     """
-    ingester = MarkdownIngester()
+    ingester = ingester or _default_ingester()
     note = ingester.parse_file(file_path)
 
     return {
@@ -640,24 +730,52 @@ def parse_obsidian_note(file_path: str) -> Dict[str, Any]:
     }
 
 
-def vault_to_dict(vault_path: str) -> Dict[str, Dict]:
+def _parse_notes(file_paths: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse a chunk of notes, capturing per-file errors (process pool worker).
+
+    Args:
+        file_paths: Markdown files to parse
+
+    Returns:
+        (file_path, parsed note or error dict) pairs, in input order
+    """
+    ingester = _default_ingester()
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append((file_path, parse_obsidian_note(file_path, ingester)))
+        except Exception as e:
+            results.append((file_path, {"error": str(e)}))
+    return results
+
+
+def vault_to_dict(vault_path: str, workers: Optional[int] = None) -> Dict[str, Dict]:
     """
     Convert entire vault to dictionary (no database required).
 
     Args:
         vault_path: Path to Obsidian vault
+        workers: Parse in this many processes (default: serial, in-process)
 
     Returns:
         Dictionary with file paths as keys, parsed notes as values
     """
-    ingester = MarkdownIngester()
     vault = Path(vault_path)
+    file_paths = list(walk_files(str(vault), ['.md']))
+
+    if not workers or workers <= 1 or len(file_paths) < 2:
+        return dict(_parse_notes(file_paths))
+
+    # Parsing is CPU-bound Python - spread chunks of notes over processes
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunk_size = max(1, len(file_paths) // (workers * 4))
+    chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
 
     result = {}
-    for md_file in vault.glob("**/*.md"):
-        try:
-            result[str(md_file)] = parse_obsidian_note(str(md_file))
-        except Exception as e:
-            result[str(md_file)] = {"error": str(e)}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for parsed in executor.map(_parse_notes, chunks):
+            result.update(parsed)
 
     return result
@@ -0,0 +1,291 @@
+"""
+File Index for Theophysics Ingest Engine
+
+A small SQLite sidecar recording which files have already been ingested,
+so repeat runs over a vault can skip files that haven't changed.
+
+Change detection:
+- Fast path: (mtime_ns, size) match the recorded values -> unchanged
+- Same size, different mtime: compare content hashes (mtime can be
+  unreliable on network mounts and after copies/syncs)
+- Anything else, or not recorded yet -> changed
+
+changed() also remembers the stat and hash of each file it returns, and
+record() stores those rather than re-reading the file after ingest, so an
+edit made while a file is being ingested still shows up as a change.
+
+An index belongs to one database: opening it for a different database
+(e.g. a new URL) empties it, so every file is ingested again. A database
+that was wiped behind the same URL can't be detected - delete the index
+file (or use a new one) when recreating the database.
+
+Stored hashes are compared as opaque strings, so switching hash_algorithm
+on an existing index only costs one re-ingest of files that were touched
+since they were recorded (their old hash can't match); they're re-recorded
+with the new algorithm.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.hashing import check_file_hash_algorithm, hash_file
+
+
+# Keep IN (...) lists under SQLite's default host-parameter limit
+_QUERY_CHUNK = 900
+
+# Threads for hashing files; hashlib releases the GIL while it hashes, so reads
+# and digests overlap. The SQLite connection stays on the calling thread.
+_HASH_THREADS = 8
+
+# Hashes remembered per (path, size, mtime_ns), least recently used evicted first
+_HASH_CACHE_SIZE = 65536
+
+
+def _parallel_map(func: Callable, items: Sequence) -> list:
+    """map() over a thread pool, keeping input order (serial for 0-1 items)"""
+    if len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_HASH_THREADS, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+class FileIndex:
+    """
+    Tracks ingested files in a local SQLite database.
+
+    Usage:
+        index = FileIndex("~/.theophysics/file_index.sqlite")
+        todo = index.changed(paths)
+        ...ingest todo...
+        index.record([(path, session_id), ...])
+    """
+
+    def __init__(self, index_path: str, hash_algorithm: str = "blake2b",
+                 database: Optional[str] = None):
+        """
+        Open (or create) the index.
+
+        Args:
+            index_path: Path to the SQLite file
+            hash_algorithm: Content hash for change checks - "blake2b" or
+                "blake3" (faster on large files; needs the blake3 package)
+            database: Identity of the database files are ingested into, e.g.
+                its URL (only a hash of it is stored). If the index was built
+                for another database - or before databases were tracked - it is
+                emptied. None leaves the index as it is.
+        """
+        check_file_hash_algorithm(hash_algorithm)
+        self.hash_algorithm = hash_algorithm
+
+        # In-process memo so a file is hashed once per version, e.g. when
+        # changed() both verifies it and remembers it for record()
+        self._hash_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._hash_cache_lock = threading.Lock()
+
+        # (mtime_ns, size, hash) seen by changed() for files it returned, per path
+        self._observed: Dict[str, Tuple[int, int, str]] = {}
+
+        index_path = os.path.expanduser(index_path)
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.index_path = index_path
+        self.conn = sqlite3.connect(index_path)
+        # Same tuning as SQLite ingest databases (see db.schema): cheap commits
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # WITHOUT ROWID stores rows in the path B-tree itself, so lookups by
+        # path read the row directly instead of going index -> rowid -> row
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT,
+                session_id INTEGER
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        if database is not None:
+            self._check_database(database)
+        self.conn.commit()
+
+    def _check_database(self, database: str):
+        """Empty the index if it was recorded for a different database"""
+        # Hashed so credentials in the URL don't end up in the sidecar file
+        identity = hashlib.sha256(database.encode('utf-8')).hexdigest()
+        row = self.conn.execute("SELECT value FROM index_meta WHERE key = 'database'").fetchone()
+        if row is not None and row[0] == identity:
+            return
+        self.conn.execute("DELETE FROM ingested_files")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('database', ?)", (identity,)
+        )
+
+    def changed(self, paths: Iterable[str], observe: bool = True) -> List[str]:
+        """
+        Filter paths down to those that are new or modified since recorded.
+
+        Args:
+            paths: File paths to check
+            observe: Hash the returned files now for record() to store; pass
+                False when they won't be recorded (e.g. no database)
+
+        Returns:
+            Paths needing ingest, in input order
+        """
+        paths = list(paths)
+        recorded = {}
+        for start in range(0, len(paths), _QUERY_CHUNK):
+            chunk = paths[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT path, mtime_ns, size, hash FROM ingested_files "
+                f"WHERE path IN ({placeholders})", chunk
+            )
+            for path, mtime_ns, size, content_hash in rows:
+                recorded[path] = (mtime_ns, size, content_hash)
+
+        result = []
+        to_verify = []
+        observed = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                result.append(path)
+                continue
+
+            entry = recorded.get(path)
+            if entry is None:
+                result.append(path)
+                observed[path] = st
+                continue
+
+            mtime_ns, size, content_hash = entry
+            if st.st_mtime_ns == mtime_ns and st.st_size == size:
+                continue
+
+            # Touched but possibly identical - the content decides, below
+            if st.st_size == size and content_hash:
+                to_verify.append((path, st, content_hash))
+
+            result.append(path)
+            observed[path] = st
+
+        touched = []
+        if to_verify:
+            current = _parallel_map(self._try_hash, [(path, st) for path, st, _ in to_verify])
+            for (path, st, content_hash), current_hash in zip(to_verify, current):
+                if current_hash == content_hash:
+                    touched.append((st.st_mtime_ns, path))
+            if touched:
+                unchanged = {path for _, path in touched}
+                result = [path for path in result if path not in unchanged]
+
+        # Remember new mtimes so the fast path hits next time
+        if touched:
+            self.conn.executemany(
+                "UPDATE ingested_files SET mtime_ns = ? WHERE path = ?", touched
+            )
+            self.conn.commit()
+
+        if not observe:
+            return result
+
+        # Hash what will be ingested now, before it can change under the ingest;
+        # files verified above come from the hash cache
+        pending = [(path, observed[path]) for path in result if path in observed]
+        hashes = _parallel_map(self._try_hash, pending)
+        for (path, st), content_hash in zip(pending, hashes):
+            if content_hash is not None:
+                self._observed[path] = (st.st_mtime_ns, st.st_size, content_hash)
+
+        return result
+
+    def record(self, entries: Iterable[Tuple[str, Optional[int]]]):
+        """
+        Record successfully ingested files in one transaction.
+
+        Files returned by changed() are recorded with the stat and hash taken
+        there, i.e. the version that was ingested; others are read now.
+
+        Args:
+            entries: (path, session_id) pairs; path as passed to changed(),
+                session_id of the ingest session that processed it, if known
+        """
+        rows = []
+        unseen = []
+        for path, session_id in entries:
+            seen = self._observed.pop(path, None)
+            if seen is None:
+                unseen.append((path, session_id))
+            else:
+                rows.append((path, *seen, session_id))
+
+        stats = _parallel_map(self._stat_and_hash, [path for path, _ in unseen])
+        for (path, session_id), stat_hash in zip(unseen, stats):
+            if stat_hash is None:
+                continue  # Gone since ingest - it'll show up as new if it returns
+            st, content_hash = stat_hash
+            rows.append((path, st.st_mtime_ns, st.st_size, content_hash, session_id))
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO ingested_files (path, mtime_ns, size, hash, session_id) "
+            "VALUES (?, ?, ?, ?, ?)", rows
+        )
+        self.conn.commit()
+
+    def clear_observed(self):
+        """Forget what changed() saw for files that were never record()ed (e.g. failed ingests)"""
+        self._observed.clear()
+
+    def _hash(self, path: str, st: os.stat_result) -> str:
+        """Hash a file with the index's algorithm, reusing the hash of an unchanged stat"""
+        key = (path, st.st_size, st.st_mtime_ns)
+        with self._hash_cache_lock:
+            content_hash = self._hash_cache.get(key)
+            if content_hash is not None:
+                self._hash_cache.move_to_end(key)
+                return content_hash
+
+        content_hash = hash_file(path, algorithm=self.hash_algorithm)
+
+        with self._hash_cache_lock:
+            self._hash_cache[key] = content_hash
+            if len(self._hash_cache) > _HASH_CACHE_SIZE:
+                self._hash_cache.popitem(last=False)
+        return content_hash
+
+    def _try_hash(self, path_stat: Tuple[str, os.stat_result]) -> Optional[str]:
+        """Hash an already-stat()ed file (None if it can't be read)"""
+        try:
+            return self._hash(*path_stat)
+        except OSError:
+            return None
+
+    def _stat_and_hash(self, path: str) -> Optional[Tuple[os.stat_result, str]]:
+        """stat() and hash a file (None if it's gone or unreadable)"""
+        try:
+            st = os.stat(path)
+            return st, self._hash(path, st)
+        except OSError:
+            return None
+
+    def close(self):
+        """Close the index database"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
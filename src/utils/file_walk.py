@@ -0,0 +1,98 @@
+"""
+Directory Walking for Theophysics Ingest Engine
+
+One os.scandir walker shared by the ingesters' directory/vault loops and the
+orchestrator's directory scan, so they all see the same files.
+
+Rules (same everywhere):
+- Symlinked directories are not descended into; symlinked files are listed
+- Unreadable directories are skipped
+- Extensions match case-insensitively (report.XLSX is an Excel file), as
+  Path.glob did on Windows
+
+Cheaper than Path.glob/rglob:
+- One pass over the tree no matter how many extensions are wanted
+- Names are matched with str.endswith(tuple), the loop running in C
+- No Path object per entry; DirEntry type checks reuse what readdir returned
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
+
+
+def list_directory(path: str) -> Tuple[List[str], List[str]]:
+    """
+    List one directory.
+
+    Returns:
+        (subdirectory paths, file names); both empty if it can't be read
+    """
+    subdirs, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        pass
+    return subdirs, files
+
+
+def walk_directories(root: str, recursive: bool = True,
+                     threads: int = 1) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield (directory, file names) for root and, if recursive, its subdirectories.
+
+    Directories are visited breadth-first. With threads > 1 each level is
+    listed concurrently on a bounded thread pool, so slow (e.g.
+    network-mounted) directories don't serialize the walk.
+
+    Args:
+        root: Directory to walk
+        recursive: Descend into subdirectories
+        threads: Directories listed at once
+    """
+    pool = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+    pending = deque([root])
+    try:
+        while pending:
+            level = list(pending)
+            pending.clear()
+            listings = pool.map(list_directory, level) if pool else map(list_directory, level)
+            for directory, (subdirs, files) in zip(level, listings):
+                if recursive:
+                    pending.extend(subdirs)
+                yield directory, files
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def walk_files(root: str, extensions: Iterable[str], recursive: bool = True) -> Iterator[str]:
+    """
+    Yield paths of files under root whose names end with one of extensions.
+
+    Paths are yielded as each directory is listed, so callers can start work
+    before the whole tree is walked.
+
+    Args:
+        root: Directory to walk
+        extensions: Name suffixes to match, e.g. ['.xlsx', '.xls'] (any case)
+        recursive: Descend into subdirectories
+
+    Returns:
+        Iterator of file paths (root joined with the relative path)
+    """
+    suffixes = tuple(extension.lower() for extension in extensions)
+    for directory, names in walk_directories(root, recursive):
+        for name in names:
+            if name.lower().endswith(suffixes):
+                yield os.path.join(directory, name)
@@ -0,0 +1,105 @@
+"""
+Content Hashing for Theophysics Ingest Engine
+
+One place for the hashes stored in content_hash columns and the file index.
+
+content_hash columns use SHA-256, as they always have, so hashes stay
+comparable with rows already in existing databases.
+
+The file index (hash_file) uses BLAKE2b with a 32-byte digest instead:
+- Faster than SHA-256 in hashlib, and still collision-resistant
+- Only compared with other hash_file() output, never with content_hash
+
+hash_file() can use BLAKE3 instead when the optional blake3 package is
+installed (SIMD + multithreaded, memory-mapped). Its digests are also
+64 hex characters, but never equal BLAKE2b ones - don't mix them in one index.
+"""
+
+import hashlib
+import importlib.util
+import mmap
+import os
+
+
+# Characters encoded per update() when hashing large strings
+_ENCODE_CHUNK = 64 * 1024
+
+# Files larger than this are hashed from a memory map in one update() call
+_MMAP_THRESHOLD = 1 << 20
+
+# Algorithms accepted by hash_file()
+FILE_HASH_ALGORITHMS = ("blake2b", "blake3")
+
+
+def hash_content(content: str) -> str:
+    """
+    Hash text content for deduplication.
+
+    Large strings are encoded and fed to the hash in slices, so peak memory
+    doesn't include a full UTF-8 copy of the document.
+
+    Args:
+        content: Text to hash (UTF-8 encoded)
+
+    Returns:
+        64-character hex SHA-256 digest
+    """
+    if len(content) <= _ENCODE_CHUNK:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    digest = hashlib.sha256()
+    for start in range(0, len(content), _ENCODE_CHUNK):
+        digest.update(content[start:start + _ENCODE_CHUNK].encode('utf-8'))
+    return digest.hexdigest()
+
+
+def check_file_hash_algorithm(algorithm: str):
+    """
+    Fail early if hash_file() can't use the given algorithm.
+
+    Raises:
+        ValueError: Unknown algorithm, or blake3 requested but not installed
+    """
+    if algorithm not in FILE_HASH_ALGORITHMS:
+        raise ValueError(f"Unknown file hash algorithm: {algorithm} "
+                         f"(expected one of {', '.join(FILE_HASH_ALGORITHMS)})")
+    if algorithm == "blake3" and importlib.util.find_spec("blake3") is None:
+        raise ValueError("File hash algorithm 'blake3' needs the blake3 package (pip install blake3)")
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20, algorithm: str = "blake2b") -> str:
+    """
+    Hash a file's contents, reading it in chunks.
+
+    Args:
+        file_path: Path to file
+        chunk_size: Bytes read per chunk (blake2b files up to 1 MiB, or not mappable)
+        algorithm: "blake2b" (default) or "blake3" (needs the blake3 package)
+
+    Returns:
+        64-character hex digest
+    """
+    if algorithm == "blake3":
+        import blake3
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher.hexdigest()
+    if algorithm != "blake2b":
+        check_file_hash_algorithm(algorithm)
+
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None  # Not mappable (some network/special files) - read instead
+            if mapped is not None:
+                # One C-level pass, no per-chunk bytes objects
+                with mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,6 @@
+"""Test setup: make the src/ modules importable as the ingest engine imports them"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
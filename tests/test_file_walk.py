@@ -0,0 +1,77 @@
+"""Tests for utils.file_walk and the orchestrator's directory scan built on it"""
+
+import os
+
+import pytest
+
+from orchestrator import FileType, IngestOrchestrator
+from utils.file_walk import list_directory, walk_directories, walk_files
+
+
+def _relative(root, paths):
+    return sorted(os.path.relpath(path, root) for path in paths)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub" / "deeper").mkdir(parents=True)
+    for name in ["a.md", "B.MD", "notes.txt", "sub/c.Md", "sub/deeper/d.md",
+                 "x.XLSX", "y.xls", "page.HTM", "noext"]:
+        (root / name).write_text("x")
+    return root
+
+
+@pytest.fixture
+def linked_tree(tree, tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "elsewhere.md").write_text("x")
+    try:
+        os.symlink(outside, tree / "dirlink.md")
+        os.symlink(outside / "elsewhere.md", tree / "filelink.md")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported here")
+    return tree
+
+
+def test_walk_files_matches_suffix_in_any_case(tree):
+    assert _relative(tree, walk_files(str(tree), [".md"])) == [
+        "B.MD", "a.md", os.path.join("sub", "c.Md"), os.path.join("sub", "deeper", "d.md")]
+    assert _relative(tree, walk_files(str(tree), [".XLSX", ".xls"])) == ["x.XLSX", "y.xls"]
+
+
+def test_walk_files_non_recursive(tree):
+    assert _relative(tree, walk_files(str(tree), [".md"], recursive=False)) == ["B.MD", "a.md"]
+
+
+def test_walk_files_missing_root_yields_nothing(tmp_path):
+    assert list(walk_files(str(tmp_path / "missing"), [".md"])) == []
+
+
+def test_symlinked_directories_are_not_followed(linked_tree):
+    found = _relative(linked_tree, walk_files(str(linked_tree), [".md"]))
+    assert "filelink.md" in found
+    assert "dirlink.md" not in found
+    assert not any("elsewhere" in path for path in found)
+
+    subdirs, files = list_directory(str(linked_tree))
+    assert "dirlink.md" not in files
+    assert str(linked_tree / "dirlink.md") not in subdirs
+
+
+def test_threaded_walk_lists_the_same_directories(tree):
+    serial = {directory: sorted(files) for directory, files in walk_directories(str(tree))}
+    threaded = {directory: sorted(files) for directory, files in walk_directories(str(tree), threads=4)}
+    assert serial == threaded
+    assert len(serial) == 3
+
+
+def test_orchestrator_scan_uses_the_same_rules(linked_tree):
+    orchestrator = IngestOrchestrator()
+    found = orchestrator._scan_directory(str(linked_tree), True, list(FileType))
+    found = {file_type: _relative(linked_tree, paths) for file_type, paths in found.items()}
+
+    assert found[FileType.MARKDOWN] == _relative(linked_tree, walk_files(str(linked_tree), [".md"]))
+    assert found[FileType.EXCEL] == ["x.XLSX", "y.xls"]
+    assert found[FileType.HTML] == ["page.HTM"]
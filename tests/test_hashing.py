@@ -0,0 +1,83 @@
+"""Tests for utils.hashing"""
+
+import hashlib
+
+import pytest
+
+from utils import hashing
+from utils.hashing import check_file_hash_algorithm, hash_content, hash_file
+
+
+def test_hash_content_is_sha256():
+    for text in ["", "abc", "é" * 10]:
+        assert hash_content(text) == hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def test_hash_content_large_string_matches_one_shot(monkeypatch):
+    monkeypatch.setattr(hashing, "_ENCODE_CHUNK", 7)
+    text = "größer als ein Stück " * 50
+    assert hash_content(text) == hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _blake2b(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def test_hash_file_small_file_reads_in_chunks(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path / "small.bin"
+    path.write_bytes(data)
+    assert hash_file(str(path), chunk_size=100) == _blake2b(data)
+
+
+def test_hash_file_large_file_uses_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashing, "_MMAP_THRESHOLD", 1024)
+    mapped = []
+    real_mmap = hashing.mmap.mmap
+    monkeypatch.setattr(hashing.mmap, "mmap", lambda *a, **k: mapped.append(a) or real_mmap(*a, **k))
+
+    data = b"0123456789abcdef" * 1000
+    path = tmp_path / "large.bin"
+    path.write_bytes(data)
+    assert hash_file(str(path)) == _blake2b(data)
+    assert mapped
+
+
+def test_hash_file_falls_back_when_mmap_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashing, "_MMAP_THRESHOLD", 1024)
+
+    def unmappable(*args, **kwargs):
+        raise OSError("not mappable")
+
+    monkeypatch.setattr(hashing.mmap, "mmap", unmappable)
+    data = b"x" * 5000
+    path = tmp_path / "large.bin"
+    path.write_bytes(data)
+    assert hash_file(str(path), chunk_size=333) == _blake2b(data)
+
+
+def test_hash_file_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert hash_file(str(path)) == _blake2b(b"")
+
+
+def test_hash_file_blake3(tmp_path):
+    blake3 = pytest.importorskip("blake3")
+    data = b"blake3 data " * 1000
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    assert hash_file(str(path), algorithm="blake3") == blake3.blake3(data).hexdigest()
+
+
+def test_check_file_hash_algorithm_rejects_unknown():
+    with pytest.raises(ValueError):
+        check_file_hash_algorithm("md5")
+    with pytest.raises(ValueError):
+        hash_file(__file__, algorithm="md5")
+
+
+def test_check_file_hash_algorithm_blake3_missing(monkeypatch):
+    monkeypatch.setattr(hashing.importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ValueError, match="blake3"):
+        check_file_hash_algorithm("blake3")